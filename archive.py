@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按内容寻址的归档：每日简报和 seen 快照压成 gzip 段，文件名即内容哈希，
+相同内容只存一份；archive/manifest.json 记录每天引用了哪些段。
+
+seen 快照按条目日期分段 —— 往日的条目不再变，那几段天天复用，
+所以每天新增的通常只有两段：当天简报 + 当天新记的 seen 条目。
+
+    python archive.py list                 # 已归档的日期
+    python archive.py show 2026-08-21      # 还原某天的简报
+    python archive.py seen 2026-08-21      # 还原某天跑完后的 seen.json
+    python archive.py import               # 把 out/*.md、state/seen.json 导入归档
+"""
+
+import sys
+import gzip
+import json
+import hashlib
+import pathlib
+import argparse
+from typing import Dict, List
+
+ARCHIVE_DIR = pathlib.Path("archive")
+SEGMENT_DIR = ARCHIVE_DIR / "segments"
+MANIFEST_PATH = ARCHIVE_DIR / "manifest.json"
+
+
+def put_segment(data: bytes) -> str:
+    """存一段内容，返回段 id。已存在就直接返回，不重写。"""
+    sid = hashlib.sha256(data).hexdigest()[:24]
+    path = SEGMENT_DIR / f"{sid}.gz"
+    if not path.exists():
+        SEGMENT_DIR.mkdir(parents=True, exist_ok=True)
+        # mtime=0：同样的内容压出同样的字节，git 里不会因为时间戳产生新 blob
+        path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    return sid
+
+
+def get_segment(sid: str) -> bytes:
+    return gzip.decompress((SEGMENT_DIR / f"{sid}.gz").read_bytes())
+
+
+def load_manifest() -> Dict:
+    if not MANIFEST_PATH.exists():
+        return {"version": 1, "latest": "", "days": {}}
+    return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+
+
+def save_manifest(m: Dict) -> None:
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(
+        json.dumps(m, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8",
+    )
+
+
+def put_seen(seen: Dict[str, str]) -> List[str]:
+    """seen 按条目日期分组，每组一段。"""
+    groups: Dict[str, Dict[str, str]] = {}
+    for k, v in seen.items():
+        groups.setdefault(v, {})[k] = v
+    return [
+        put_segment(json.dumps(groups[d], sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        for d in sorted(groups)
+    ]
+
+
+def archive_day(day: str, briefing: str, seen: Dict[str, str]) -> None:
+    m = load_manifest()
+    m["days"][day] = {"briefing": put_segment(briefing.encode("utf-8")), "seen": put_seen(seen)}
+    m["latest"] = max(m["days"])
+    save_manifest(m)
+
+
+def read_briefing(day: str = "") -> str:
+    m = load_manifest()
+    return get_segment(m["days"][day or m["latest"]]["briefing"]).decode("utf-8")
+
+
+def read_seen(day: str = "") -> Dict[str, str]:
+    """还原某天（缺省为最新一天）跑完后的 seen。归档为空时返回空 dict。"""
+    m = load_manifest()
+    day = day or m["latest"]
+    if not day:
+        return {}
+    seen: Dict[str, str] = {}
+    for sid in m["days"][day]["seen"]:
+        seen.update(json.loads(get_segment(sid)))
+    return seen
+
+
+def import_legacy(out_dir: pathlib.Path, seen_path: pathlib.Path) -> List[str]:
+    """
+    一次性导入旧的 out/YYYY-MM-DD.md 和 state/seen.json。
+    旧仓库没留每天的 seen 快照，按"日期不晚于当天的条目"近似还原。
+    """
+    seen = json.loads(seen_path.read_text(encoding="utf-8")) if seen_path.exists() else {}
+    days = sorted(p.stem for p in out_dir.glob("????-??-??.md"))
+    for day in days:
+        body = (out_dir / f"{day}.md").read_text(encoding="utf-8")
+        archive_day(day, body, {k: v for k, v in seen.items() if v <= day})
+    return days
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="简报 / seen 归档读写")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list")
+    sub.add_parser("show").add_argument("day", nargs="?", default="")
+    sub.add_parser("seen").add_argument("day", nargs="?", default="")
+    imp = sub.add_parser("import")
+    imp.add_argument("--out", type=pathlib.Path, default=pathlib.Path("out"))
+    imp.add_argument("--seen", type=pathlib.Path, default=pathlib.Path("state/seen.json"))
+    args = ap.parse_args()
+
+    try:
+        return run(args)
+    except KeyError as ex:
+        print(f"归档里没有 {ex.args[0]}", file=sys.stderr)
+        return 1
+
+
+def run(args) -> int:
+    if args.cmd == "list":
+        m = load_manifest()
+        for day in sorted(m["days"]):
+            print(f"{day}  {len(m['days'][day]['seen'])} 段 seen" + ("  ← latest" if day == m["latest"] else ""))
+    elif args.cmd == "show":
+        print(read_briefing(args.day))
+    elif args.cmd == "seen":
+        print(json.dumps(read_seen(args.day), ensure_ascii=False, indent=0, sort_keys=True))
+    elif args.cmd == "import":
+        days = import_legacy(args.out, args.seen)
+        print(f"已导入 {len(days)} 天：{', '.join(days) or '无'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,10 +11,6 @@ import time
 import datetime
 from collections import Counter
 
-import requests
-import feedparser
-from bs4 import BeautifulSoup
-
 from main import (
     CHINA_RSS_FEEDS, OVERSEAS_FEEDS, CHINA_HTML_SOURCES,
     fetch_html_links, UA, REQ_TIMEOUT,
@@ -22,6 +18,9 @@ from main import (
 
 
 def check_rss(name, url):
+    import requests
+    import feedparser
+
     try:
         r = requests.get(url, timeout=REQ_TIMEOUT, headers={"User-Agent": UA})
         r.raise_for_status()
@@ -62,6 +61,10 @@ def main():
     for name, url in OVERSEAS_FEEDS:
         print(check_rss(name, url))
 
+    # bs4 约 100ms，只有 HTML 段要用，放到这里才导入，RSS 段的结果能先出来
+    import requests
+    from bs4 import BeautifulSoup
+
     print("\n── 中国 HTML " + "─" * 49)
     for src in CHINA_HTML_SOURCES:
         print(f"\n[{src['name']}] {src['url']}")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻模式。各信源按自己的间隔轮询，新的合格条目攒够 DELTA_MIN_ITEMS 条就推一条
+增量快讯；每天 MORNING_AT（UTC+8）照常出完整晨报。
+
+    SENDKEY=xxx python daemon.py
+
+和 Actions 定时任务二选一，别同时跑 —— 两边共用 state/seen.json。
+
+去重状态和 ETag/Last-Modified 常驻内存：源没更新时服务器回 304，不下载不解析；
+有更新时也只有没见过的标题才进分类。所以一次轮询的开销只跟新增条数有关。
+"""
+
+import os
+import sys
+import time
+import datetime
+from typing import Dict, List
+
+from main import (
+    CHINA_RSS_FEEDS, OVERSEAS_FEEDS, CHINA_HTML_SOURCES,
+    MAX_DEALS, MAX_FUNDS, MAX_OVERSEAS, SRC_STATUS, HTTP_VALIDATORS,
+    fetch_rss, fetch_html_links, classify, norm_key, refine_with_model, top_k,
+    render_briefing, publish, post_with_retry, finish_delivery,
+    load_seen, save_seen, log,
+)
+
+# 默认轮询间隔（分钟）。个别源更新慢或有频控，单独放宽。
+POLL_MINUTES = 20
+POLL_MINUTES_BY_SOURCE = {
+    "TechCrunch Funding": 60,
+    "FierceBiotech": 60,
+    "创业邦-融资": 30,
+}
+
+# 攒够这么多条新的合格条目才推一条快讯，避免一条一推刷屏
+DELTA_MIN_ITEMS = 3
+
+# 完整晨报的时间（UTC+8），与 daily.yml 的 cron 对齐
+MORNING_AT = (6, 23)
+
+# 两轮检查之间最多睡多久（秒）
+MAX_SLEEP = 60
+
+# 晨报失败后多久重试（秒）
+MORNING_RETRY = 600
+
+
+def now_cn() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=8)
+
+
+def next_morning(after: datetime.datetime) -> datetime.datetime:
+    t = after.replace(hour=MORNING_AT[0], minute=MORNING_AT[1], second=0, microsecond=0)
+    return t if t > after else t + datetime.timedelta(days=1)
+
+
+def sources() -> List[tuple]:
+    """[(name, kind, fetch)]，kind 为 cn/os，决定走哪套分类规则。"""
+    out = []
+    for name, url in CHINA_RSS_FEEDS:
+        out.append((name, "cn", lambda n=name, u=url: fetch_rss(n, u)))
+    for src in CHINA_HTML_SOURCES:
+        out.append((src["name"], "cn", lambda s=src: fetch_html_links(s)))
+    for name, url in OVERSEAS_FEEDS:
+        out.append((name, "os", lambda n=name, u=url: fetch_rss(n, u, limit=60)))
+    return out
+
+
+def render_delta(items: List[Dict], now: datetime.datetime):
+    kinds = {"deals": "融资", "funds": "基金", "overseas": "海外"}
+    md = [f"# {now:%H:%M} 增量快讯（{len(items)}）\n"]
+    for kind, x in items:
+        md.append(f"- [{kinds[kind]}] **[{x['title']}]({x['link']})**"
+                  f" — {x['amount_hint']}｜{x['src']}")
+    md.append(f"\n---\n完整晨报 {MORNING_AT[0]:02d}:{MORNING_AT[1]:02d} 照常推送")
+    title = f"{now:%m-%d %H:%M} 投融资快讯 | {len(items)}条"
+    return title, "\n".join(md)
+
+
+def run(sendkey: str) -> None:
+    seen = load_seen()
+    log(f"常驻模式启动，已有去重记录 {len(seen)} 条")
+
+    srcs = sources()
+    due = {name: 0.0 for name, _, _ in srcs}
+    known = set()          # 已进过分类的标题指纹，下次轮询直接跳过
+    day = {"deals": {}, "funds": {}, "overseas": {}}   # 上次晨报以来的合格条目
+    pending: List[tuple] = []                           # 还没推快讯的 (kind, item)
+    # 已完成首轮抓取的源。首轮拿到的是整个时间窗里的存量，只用来垫底 known/day，
+    # 不进快讯 —— 否则每次启动（和每天晨报后重抓）都会把旧闻当快讯推一遍
+    primed = set()
+    morning = next_morning(now_cn())
+
+    while True:
+        for name, kind, fetch in srcs:
+            if due[name] > time.time():
+                continue
+            due[name] = time.time() + POLL_MINUTES_BY_SOURCE.get(name, POLL_MINUTES) * 60
+
+            fresh = []
+            for it in fetch():
+                k = norm_key(it.get("title", ""))
+                if k not in known:
+                    fresh.append(it)
+                    continue
+                # 见过的标题不再分类，但别的源也报了它，就记作印证，晨报排序时加分
+                for bucket in day.values():
+                    if k in bucket:
+                        bucket[k]["_srcs"].add(it.get("src", name))
+            # 只保留每个源最近一次的状态，晨报里的信源健康才不会越滚越长
+            status = {s["name"]: s for s in SRC_STATUS}
+            SRC_STATUS[:] = list(status.values())
+            first = name not in primed
+            if status.get(name, {}).get("ok"):
+                primed.add(name)   # 抓取失败不算首轮，下次成功时再垫底
+            if not fresh:
+                continue
+            known.update(norm_key(it.get("title", "")) for it in fresh)
+
+            if kind == "cn":
+                deals, funds, overseas = classify(fresh, [], seen)
+            else:
+                deals, funds, overseas = classify([], fresh, seen)
+            for bucket, xs in (("deals", deals), ("funds", funds), ("overseas", overseas)):
+                for x in xs:
+                    if x["_k"] not in day[bucket]:
+                        day[bucket][x["_k"]] = x
+                        if not first:
+                            pending.append((bucket, x))
+            log(f"{name}: {'首轮存量' if first else '新标题'} {len(fresh)} 条，"
+                f"合格 {len(deals) + len(funds) + len(overseas)} 条")
+
+        if len(pending) >= DELTA_MIN_ITEMS:
+            title, body = render_delta(pending, now_cn())
+            try:
+                post_with_retry(sendkey, title, body)
+                log(f"快讯推送成功：{title}")
+                # 快讯推过的立刻记进 seen，哪怕晨报截断掉它，也不会再作为快讯重推
+                today = now_cn().strftime("%Y-%m-%d")
+                for _, x in pending:
+                    seen[x["_k"]] = today
+                save_seen(seen)
+                pending = []
+            except Exception as ex:
+                log(f"快讯推送失败，下轮重试：{type(ex).__name__} — {ex}")
+
+        if now_cn() >= morning:
+            now = now_cn()
+            today = now.strftime("%Y-%m-%d")
+            try:
+                # 今天的晨报上次推到一半的话，续推完就算数，不再另出一份
+                if finish_delivery(sendkey, seen) != today:
+                    deals = refine_with_model(top_k(day["deals"].values(), MAX_DEALS))
+                    funds = top_k(day["funds"].values(), MAX_FUNDS)
+                    overseas = top_k(day["overseas"].values(), MAX_OVERSEAS)
+                    title, body = render_briefing(deals, funds, overseas, now)
+                    publish(sendkey, title, body, deals + funds + overseas, seen, today)
+                # 新的一天从头攒。校验值也一并清掉，否则没变的源回 304、什么都不返回，
+                # 没入选晨报又没推过快讯的条目就再也进不了分类；清掉后下次轮询整页
+                # 重抓，它们只要还在时间窗内就会重新参与排序。
+                known.clear()
+                HTTP_VALIDATORS.clear()
+                primed.clear()     # 重抓回来的是存量，同样只垫底不推快讯
+                day = {"deals": {}, "funds": {}, "overseas": {}}
+                pending = []
+                morning = next_morning(now)
+            except Exception as ex:
+                log(f"晨报失败，{MORNING_RETRY // 60} 分钟后重试：{type(ex).__name__} — {ex}")
+                morning = now + datetime.timedelta(seconds=MORNING_RETRY)
+
+        wait = min(min(due.values()) - time.time(), (morning - now_cn()).total_seconds())
+        time.sleep(max(1.0, min(wait, MAX_SLEEP)))
+
+
+def main() -> int:
+    sendkey = os.environ.get("SENDKEY")
+    if not sendkey:
+        print("FATAL: 环境变量 SENDKEY 未配置", file=sys.stderr)
+        return 2
+    try:
+        run(sendkey)
+    except KeyboardInterrupt:
+        log("收到中断，退出")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
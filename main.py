@@ -12,10 +12,16 @@
   6. 信源健康统计，写进推送标题
   7. 产出落盘到 out/，供 GitHub Actions 上传 artifact
   8. 可选的模型精炼层（设了 ANTHROPIC_API_KEY 才启用，失败自动降级）
+  9. 条件请求（ETag/Last-Modified）+ 抓取/分类/组装拆开，供常驻模式 daemon.py 复用
+ 10. 超长简报按小节分段推送，带重试和断点续推（state/delivery.json），不再硬截断
+ 11. 重依赖延迟导入；关键词表首次使用时编译成一条正则并缓存
+ 12. 简报和 seen 快照进 archive/ 按内容寻址归档；out/、seen.json 不再入库
+ 13. 候选按金额/轮次/赛道/信源/多源印证打分，有界堆取前 K，取代先到先得的截断
 """
 
 import os
 import re
+import math
 import sys
 import json
 import time
@@ -23,11 +29,17 @@ import html
 import hashlib
 import pathlib
 import datetime
+import heapq
+import functools
 from typing import List, Dict, Tuple
 
-import requests
-import feedparser
-from bs4 import BeautifulSoup
+import archive
+
+# requests / feedparser / bs4 不在这里导入：三者合计约 170ms，
+# 只在真正抓取、推送的函数里按需导入。只 import main 用分类规则的代码
+# （classify、is_true_deal 之类，本地调规则时常这么用）不用付这笔成本；
+# check_sources.py、daemon.py 都要联网，三个库照样会加载，只是推迟到用时 ——
+# check_sources.py 的 RSS 段因此不必等 bs4。
 
 # ======================================================================
 # 配置区
@@ -47,9 +59,62 @@ MAX_DEALS = 20
 MAX_FUNDS = 10
 MAX_OVERSEAS = 6
 
+# ----------------------------------------------------------------------
+# 排序打分。候选超过上面的条数上限时按分数取前 K，而不是谁先抓到留谁。
+# 总分 = Σ 权重 × 分项；分项的尺度见下面各表。
+# ----------------------------------------------------------------------
+
+SCORE_WEIGHTS = {
+    "amount": 1.0,          # log10(金额/万元)，1 亿 ≈ 4 分，未披露 0 分
+    "round": 1.0,           # ROUND_SCORES 首个命中
+    "sector": 1.0,          # SECTOR_PRIORITY
+    "source": 1.0,          # SOURCE_RELIABILITY，多源取最高
+    "corroboration": 1.5,   # 除首发外，另有几个源报了同一标题
+}
+
+# 按顺序匹配，首个命中即得分 —— Pre-A 要排在 A轮 前面
+ROUND_SCORES = [
+    ("并购", 2.5), ("收购", 2.5), ("Pre-IPO", 2.5),
+    ("Pre-A", 1.0), ("PreA", 1.0), ("Pre-B", 1.5),
+    ("F轮", 2.0), ("E轮", 2.0), ("D轮", 2.0), ("C轮", 2.0),
+    ("B轮", 1.5), ("A轮", 1.5), ("天使轮", 1.0), ("种子轮", 1.0),
+    ("战略融资", 1.0), ("战略投资", 1.0),
+    ("series d", 2.0), ("series c", 2.0), ("series b", 1.5),
+    ("series a", 1.5), ("seed round", 1.0),
+]
+
+SECTOR_PRIORITY = {
+    "硬科技": 3.0, "前沿科技": 3.0, "医疗/生物": 2.5, "AI": 2.5, "消费": 1.0,
+}
+
+# 未列出的源按 1.0
+SOURCE_RELIABILITY = {
+    "投资界-全站": 2.0, "投中网-创投": 2.0, "创业邦-融资": 1.5, "钛媒体": 1.0,
+    "TechCrunch Funding": 2.0, "FierceBiotech": 1.5,
+}
+
+# 设 SHOW_SCORES=1 时在简报末尾附排序明细，调权重时用
+SHOW_SCORES = os.environ.get("SHOW_SCORES") == "1"
+
+# 推送端点。本地联调指向 mock_push.py：
+#   SERVERCHAN_URL=http://127.0.0.1:8765/{sendkey}.send
+SERVERCHAN_URL = os.environ.get("SERVERCHAN_URL", "https://sctapi.ftqq.com/{sendkey}.send")
+
+# Server酱 desp 有长度上限，超出就按小节拆成多条，留点余量
+PUSH_MAX_CHARS = 30000
+
+# 单段推送的重试次数（指数退避 2s/4s/…）
+PUSH_RETRIES = 3
+
+# 断点最多续推几轮（每轮内部还有 PUSH_RETRIES 次重试）。超过次数就放弃它并告警
+# —— 否则某一段被永久拒收时，之后每天都卡在续推上，当天的简报永远出不来
+DELIVERY_MAX_ATTEMPTS = 3
+
 UA = "Mozilla/5.0 (compatible; DailyVCBriefing/2.0)"
 
 STATE_PATH = pathlib.Path("state/seen.json")
+# 分段推送的断点。推到一半失败时留在这里，下次运行先续推
+DELIVERY_PATH = pathlib.Path("state/delivery.json")
 OUT_DIR = pathlib.Path("out")
 
 OVERSEAS_FEEDS = [
@@ -186,6 +251,11 @@ OVERSEAS_HIT_WORDS = ["funding", "financing", "raises", "raised", "series a",
 
 SRC_STATUS: List[Dict] = []   # [{"name":..., "ok":bool, "n":int, "err":str}]
 
+# 条件请求的校验值：url -> {"etag":..., "last_modified":...}。
+# 单次跑批用不上；常驻模式（daemon.py）一直带着它，源没更新时服务器回 304，
+# 省掉下载和解析。
+HTTP_VALIDATORS: Dict[str, Dict[str, str]] = {}
+
 
 def log(msg: str) -> None:
     print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
@@ -201,9 +271,15 @@ def clean(s: str) -> str:
     return re.sub(r"\s+", " ", s).strip()
 
 
+@functools.lru_cache(maxsize=None)
+def keyword_re(keys: Tuple[str, ...]) -> "re.Pattern":
+    """把一张关键词表编译成一条忽略大小写的正则。每张表每个进程只编一次。"""
+    return re.compile("|".join(re.escape(k) for k in keys), re.I)
+
+
 def has_any(text: str, keys) -> bool:
-    t = (text or "").lower()
-    return any(k.lower() in t for k in keys)
+    keys = tuple(keys)
+    return bool(keys) and keyword_re(keys).search(text or "") is not None
 
 
 def norm_key(title: str) -> str:
@@ -232,6 +308,62 @@ def extract_amount(text: str) -> str:
     return "未披露"
 
 
+# 金额换算成万元人民币，只用于排序，汇率取个大概即可
+_CN_UNITS = {"亿": 1e4, "千万": 1e3, "百万": 1e2, "万": 1.0}
+_EN_UNITS = {"k": 1e-3, "m": 1.0, "million": 1.0, "b": 1e3, "billion": 1e3}   # 百万外币
+_FX = {"美元": 7.2, "美金": 7.2, "USD": 7.2, "$": 7.2, "欧元": 7.8, "€": 7.8,
+       "£": 9.1, "港元": 0.92, "日元": 0.048}
+
+
+def amount_wan(hint: str) -> float:
+    """把 extract_amount 的结果粗略换算成万元人民币；未披露或认不出返回 0。"""
+    m = re.search(r"(\d+(?:[.,]\d+)?)?\s*(亿|千万|百万|万)", hint or "")
+    if m:
+        n = float(m.group(1).replace(",", "")) if m.group(1) else 1.0
+        if re.search(r"(数|几)\s*(亿|千万|百万|万)", hint):
+            n = 3.0
+        fx = next((v for k, v in _FX.items() if k in hint), 1.0)
+        return n * _CN_UNITS[m.group(2)] * fx
+    m = re.search(r"([$€£])\s?(\d+(?:\.\d+)?)\s?(million|billion|[mbk])\b", hint or "", re.I)
+    if m:
+        return float(m.group(2)) * _EN_UNITS[m.group(3).lower()] * _FX[m.group(1)] * 100
+    return 0.0
+
+
+def score_item(x: Dict) -> float:
+    """给一条候选打分，分项明细记在 x["_why"] 里供调试段展示。"""
+    text = f"{x.get('title', '')} {x.get('round', '')}".lower()
+    wan = amount_wan(x.get("amount_hint", ""))
+    srcs = x.get("_srcs") or {x.get("src", "")}
+    parts = {
+        "amount": math.log10(wan) if wan >= 1 else 0.0,
+        "round": next((v for k, v in ROUND_SCORES if k.lower() in text), 0.0),
+        "sector": SECTOR_PRIORITY.get(x.get("sector", ""), 0.0),
+        "source": max(SOURCE_RELIABILITY.get(s, 1.0) for s in srcs),
+        "corroboration": float(len(srcs) - 1),
+    }
+    x["_why"] = parts
+    x["_score"] = sum(SCORE_WEIGHTS[k] * v for k, v in parts.items())
+    return x["_score"]
+
+
+def top_k(items, k: int) -> List[Dict]:
+    """
+    流式取分数最高的 k 条，堆里始终只留 k 个，O(n log k)。
+    同分时先到的优先，保持原先按信源顺序的观感。
+    """
+    if k <= 0:   # MAX_* 设 0 表示关掉这一栏
+        return []
+    heap: List[Tuple[float, int, Dict]] = []
+    for seq, x in enumerate(items):
+        entry = (score_item(x), -seq, x)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [x for _, _, x in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+
 def is_noise(title: str) -> bool:
     return has_any(title, NOISE_WORDS)
 
@@ -275,7 +407,11 @@ def is_true_deal(title: str) -> bool:
 
 def load_seen() -> Dict[str, str]:
     if not STATE_PATH.exists():
-        return {}
+        # seen.json 不入库，Actions 每次 checkout 都从归档里最新一天还原
+        seen = archive.read_seen()
+        if seen:
+            log(f"seen.json 不存在，从归档 {archive.load_manifest()['latest']} 还原")
+        return seen
     try:
         return json.loads(STATE_PATH.read_text(encoding="utf-8"))
     except Exception as ex:
@@ -298,10 +434,41 @@ def save_seen(seen: Dict[str, str]) -> None:
 # 抓取
 # ======================================================================
 
+def http_get(url: str):
+    """带上次的 ETag/Last-Modified 发 GET。源未变化（304）时返回 None。"""
+    import requests
+
+    headers = {"User-Agent": UA}
+    v = HTTP_VALIDATORS.get(url, {})
+    if v.get("etag"):
+        headers["If-None-Match"] = v["etag"]
+    if v.get("last_modified"):
+        headers["If-Modified-Since"] = v["last_modified"]
+
+    r = requests.get(url, timeout=REQ_TIMEOUT, headers=headers)
+    if r.status_code == 304:
+        return None
+    r.raise_for_status()
+
+    etag, lm = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if etag or lm:
+        HTTP_VALIDATORS[url] = {"etag": etag or "", "last_modified": lm or ""}
+    return r
+
+
+def _unchanged(name: str) -> List[Dict]:
+    SRC_STATUS.append({"name": name, "ok": True, "n": 0, "err": ""})
+    log(f"· {name}: 未更新（304）")
+    return []
+
+
 def fetch_rss(name: str, url: str, limit: int = 100) -> List[Dict]:
+    import feedparser
+
     try:
-        r = requests.get(url, timeout=REQ_TIMEOUT, headers={"User-Agent": UA})
-        r.raise_for_status()
+        r = http_get(url)
+        if r is None:
+            return _unchanged(name)
         d = feedparser.parse(r.content)
 
         if not d.entries:
@@ -344,11 +511,14 @@ def fetch_rss(name: str, url: str, limit: int = 100) -> List[Dict]:
 
 
 def fetch_html_links(src: Dict, limit: int = 200) -> List[Dict]:
+    from bs4 import BeautifulSoup
+
     name = src["name"]
     limit = src.get("limit", limit)   # 源可自带上限，无日期过滤的源应调小
     try:
-        r = requests.get(src["url"], timeout=REQ_TIMEOUT, headers={"User-Agent": UA})
-        r.raise_for_status()
+        r = http_get(src["url"])
+        if r is None:
+            return _unchanged(name)
         # 关键：必须传 r.content 而不是 r.text。
         # 响应头没声明 charset 时 requests 会回退到 ISO-8859-1，中文全成乱码，
         # 于是所有中文关键词规则失效、中国融资动态恒为 0。
@@ -419,6 +589,8 @@ def refine_with_model(deals: List[Dict]) -> List[Dict]:
     if not api_key or not deals:
         return deals
 
+    import requests
+
     try:
         listing = "\n".join(f"{i}. {d['title']}" for i, d in enumerate(deals, 1))
         prompt = (
@@ -475,27 +647,207 @@ def refine_with_model(deals: List[Dict]) -> List[Dict]:
 # 推送
 # ======================================================================
 
-def post_to_serverchan(sendkey: str, title: str, body: str) -> None:
-    # Server酱 desp 有长度上限，留点余量
-    if len(body) > 30000:
-        body = body[:30000] + "\n\n> ⚠ 内容过长已截断"
+def post_to_serverchan(sendkey: str, title: str, body: str, idem_key: str = "") -> None:
+    import requests
+
+    headers = {"Idempotency-Key": idem_key} if idem_key else {}
     r = requests.post(
-        f"https://sctapi.ftqq.com/{sendkey}.send",
+        SERVERCHAN_URL.format(sendkey=sendkey),
         data={"title": title[:100], "desp": body},
+        headers=headers,
         timeout=30,
     )
     r.raise_for_status()
+    # Server酱 业务错误（key 失效、超额度）也是 HTTP 200，要看 code
+    try:
+        code = r.json().get("code", 0)
+    except ValueError:
+        code = 0
+    if code:
+        raise RuntimeError(f"Server酱 返回 code={code}：{r.text[:200]}")
+
+
+def post_with_retry(sendkey: str, title: str, body: str, idem_key: str = "") -> None:
+    for attempt in range(1, PUSH_RETRIES + 1):
+        try:
+            post_to_serverchan(sendkey, title, body, idem_key)
+            return
+        except Exception as ex:
+            if attempt == PUSH_RETRIES:
+                raise
+            wait = 2 ** attempt
+            log(f"推送失败（第 {attempt} 次），{wait}s 后重试：{type(ex).__name__} — {ex}")
+            time.sleep(wait)
+
+
+def split_markdown(body: str, limit: int = PUSH_MAX_CHARS) -> List[str]:
+    """
+    按 "## " 小节切分，再贪心装箱，每段不超过 limit。
+    单个小节超长时退到按行切，单行超长才硬切 —— 正常日报走不到这一步。
+    """
+    blocks, cur = [], []
+    for line in body.split("\n"):
+        if line.startswith("## ") and cur:
+            blocks.append("\n".join(cur))
+            cur = []
+        cur.append(line)
+    blocks.append("\n".join(cur))
+
+    pieces = []
+    for b in blocks:
+        if len(b) <= limit:
+            pieces.append(b)
+            continue
+        for line in b.split("\n"):
+            pieces.extend(line[i:i + limit] for i in range(0, max(len(line), 1), limit))
+
+    parts, cur_part = [], ""
+    for p in pieces:
+        if cur_part and len(cur_part) + 1 + len(p) > limit:
+            parts.append(cur_part)
+            cur_part = p
+        else:
+            cur_part = f"{cur_part}\n{p}" if cur_part else p
+    parts.append(cur_part)
+    return [p.strip("\n") for p in parts]
+
+
+def load_delivery() -> Dict:
+    if not DELIVERY_PATH.exists():
+        return {}
+    try:
+        return json.loads(DELIVERY_PATH.read_text(encoding="utf-8"))
+    except Exception as ex:
+        log(f"delivery.json 读取失败，按无断点处理：{ex}")
+        return {}
+
+
+def save_delivery(cp: Dict) -> None:
+    DELIVERY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    DELIVERY_PATH.write_text(json.dumps(cp, ensure_ascii=False, indent=1), encoding="utf-8")
+
+
+def assign_part_keys(parts: List[str], items: List[Dict]) -> List[List[str]]:
+    """
+    每条目的指纹归到它标题所在的那一段。找不到的（正常走不到）归到最后一段，
+    整份送达后才记进 seen。
+    """
+    part_keys: List[List[str]] = [[] for _ in parts]
+    for x in items:
+        i = next((i for i, p in enumerate(parts) if f"[{x['title']}]" in p), len(parts) - 1)
+        part_keys[i].append(x["_k"])
+    return part_keys
+
+
+def commit_parts(cp: Dict, seen: Dict[str, str], upto: int) -> None:
+    """把前 upto 段里的条目记进 seen。重复记同一段是幂等的。"""
+    for keys in cp["part_keys"][:upto]:
+        for k in keys:
+            seen[k] = cp["date"]
+    save_seen(seen)
+
+
+def send_delivery(sendkey: str, cp: Dict, seen: Dict[str, str]) -> None:
+    """
+    按序推送断点里剩下的分段。每推成一段，就把这段的条目记进 seen、落一次断点。
+    中途失败直接抛出，下次从 cp["sent"] 接着推，已送达的段不会重发。
+    """
+    parts = cp["parts"]
+    n = len(parts)
+    for i in range(cp["sent"], n):
+        title, body = cp["title"], parts[i]
+        if n > 1:
+            tag = f" ({i + 1}/{n})"
+            title = title[:100 - len(tag)] + tag
+            body = f"> {tag.strip()}\n\n{body}"
+        idem = hashlib.sha256(f"{cp['id']}:{i}".encode("utf-8")).hexdigest()[:32]
+        post_with_retry(sendkey, title, body, idem)
+        cp["sent"] = i + 1
+        commit_parts(cp, seen, cp["sent"])
+        save_delivery(cp)
+        log(f"已送达 {i + 1}/{n}：{title}")
+
+
+def complete_delivery(sendkey: str, cp: Dict, seen: Dict[str, str]) -> str:
+    """推完断点里剩下的分段，再归档、清掉断点。返回简报日期。"""
+    send_delivery(sendkey, cp, seen)
+    if "body" in cp:
+        archive.archive_day(cp["date"], cp["body"], load_seen())
+    DELIVERY_PATH.unlink()
+    return cp["date"]
+
+
+def abandon_delivery(sendkey: str, cp: Dict, seen: Dict[str, str], reason: str) -> None:
+    """
+    放弃断点：删掉它并告警。已送达段的条目记进 seen；没送达那几段的不记，
+    只要还在时间窗内，就会出现在下一份简报里。
+    """
+    commit_parts(cp, seen, cp["sent"])
+    DELIVERY_PATH.unlink()
+    log(f"放弃未推完的简报 {cp['date']}（{cp['sent']}/{len(cp['parts'])}）：{reason}")
+    try:
+        post_to_serverchan(
+            sendkey,
+            f"{cp['date']} 简报分段推送已放弃",
+            f"# {cp['date']} 简报只送达 {cp['sent']}/{len(cp['parts'])} 段\n\n"
+            f"- 原因：{reason}\n"
+            f"- 已送达 {cp['sent']} 段里的条目已记去重，不会重推\n"
+            f"- 未送达段里的条目不记去重，仍在时间窗内的会随下一份简报推送",
+        )
+    except Exception as ex:
+        log(f"放弃告警也推送不出去：{type(ex).__name__} — {ex}")
+
+
+def finish_delivery(sendkey: str, seen: Dict[str, str]) -> str:
+    """
+    把上次没推完的简报推完，不管它是哪天的 —— 每天只跑一次的定时任务，
+    续推的总是前一天的断点。返回这份简报的日期；没有断点、或断点被放弃时返回空串。
+    """
+    cp = load_delivery()
+    if not cp:
+        return ""
+    if "part_keys" not in cp:   # 旧格式断点：条目只在整份送达后记
+        cp["part_keys"] = [[] for _ in cp["parts"][:-1]] + [cp.get("keys", [])]
+    attempts = cp.get("attempts", 0)
+    if attempts >= DELIVERY_MAX_ATTEMPTS:
+        abandon_delivery(sendkey, cp, seen, f"已续推 {attempts} 轮仍失败")
+        return ""
+
+    cp["attempts"] = attempts + 1
+    save_delivery(cp)
+    log(f"发现未推完的简报 {cp['date']}（{cp['sent']}/{len(cp['parts'])}），"
+        f"第 {cp['attempts']} 轮续推")
+    return complete_delivery(sendkey, cp, seen)
+
+
+def deliver(sendkey: str, title: str, body: str, new_items: List[Dict],
+            seen: Dict[str, str], today: str) -> None:
+    """
+    分段推送一份简报。先落断点再推；某段送达后这段的条目才进 seen ——
+    顺序反了的话推送失败就永久丢了这批。
+    """
+    finish_delivery(sendkey, seen)
+    parts = split_markdown(body, PUSH_MAX_CHARS - 32)   # 给分段标记留余量
+    cp = {
+        "id": hashlib.sha256(f"{title}\n{body}".encode("utf-8")).hexdigest()[:16],
+        "date": today,
+        "title": title,
+        "body": body,
+        "parts": parts,
+        "sent": 0,
+        "attempts": 1,
+        "part_keys": assign_part_keys(parts, new_items),
+    }
+    save_delivery(cp)
+    complete_delivery(sendkey, cp, seen)
 
 
 # ======================================================================
 # 主逻辑
 # ======================================================================
 
-def build_briefing(seen: Dict[str, str]) -> Tuple[str, str, List[str]]:
-    now_cn = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=8)
-    today = now_cn.strftime("%Y-%m-%d")
-
-    # ---- 1) 抓取 ----
+def fetch_all() -> Tuple[List[Dict], List[Dict]]:
+    """抓全部信源，返回 (中国池, 海外池)。"""
     pool_cn: List[Dict] = []
     for name, url in CHINA_RSS_FEEDS:
         pool_cn.extend(fetch_rss(name, url))
@@ -505,9 +857,14 @@ def build_briefing(seen: Dict[str, str]) -> Tuple[str, str, List[str]]:
     pool_os: List[Dict] = []
     for name, url in OVERSEAS_FEEDS:
         pool_os.extend(fetch_rss(name, url, limit=60))
+    return pool_cn, pool_os
+
 
-    # ---- 2) 分类过滤（基金优先，修正原版 elif 错分）----
-    deals, funds, new_keys = [], [], []
+def classify(pool_cn: List[Dict], pool_os: List[Dict],
+             seen: Dict[str, str]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """分类过滤 + 按指纹去重，返回 (融资, 基金, 海外)，不截断、不排序。"""
+    # 基金优先，修正原版 elif 错分
+    deals, funds = [], []
     for it in pool_cn:
         title = it.get("title", "")
         if not title:
@@ -530,9 +887,6 @@ def build_briefing(seen: Dict[str, str]) -> Tuple[str, str, List[str]]:
                 "src": it.get("src", ""), "_k": k,
             })
 
-    deals = list({d["_k"]: d for d in deals}.values())[:MAX_DEALS]
-    funds = list({f["_k"]: f for f in funds}.values())[:MAX_FUNDS]
-
     overseas = []
     for it in pool_os:
         title = it.get("title", "")
@@ -548,15 +902,45 @@ def build_briefing(seen: Dict[str, str]) -> Tuple[str, str, List[str]]:
                 "amount_hint": extract_amount(title + " " + it.get("summary", "")),
                 "src": it.get("src", ""), "_k": k,
             })
-    overseas = list({o["_k"]: o for o in overseas}.values())[:MAX_OVERSEAS]
+
+    return merge_dupes(deals), merge_dupes(funds), merge_dupes(overseas)
+
+
+def merge_dupes(items: List[Dict]) -> List[Dict]:
+    """按指纹去重，同一标题出现在几个源就记几个源（x["_srcs"]），供打分算印证数。"""
+    out: Dict[str, Dict] = {}
+    for x in items:
+        if x["_k"] in out:
+            out[x["_k"]]["_srcs"].add(x["src"])
+        else:
+            x["_srcs"] = {x["src"]}
+            out[x["_k"]] = x
+    return list(out.values())
+
+
+def build_briefing(seen: Dict[str, str]) -> Tuple[str, str, List[Dict]]:
+    now_cn = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=8)
+
+    # ---- 1) 抓取 ----
+    pool_cn, pool_os = fetch_all()
+
+    # ---- 2) 分类过滤 ----
+    deals, funds, overseas = classify(pool_cn, pool_os, seen)
+    deals = top_k(deals, MAX_DEALS)
+    funds = top_k(funds, MAX_FUNDS)
+    overseas = top_k(overseas, MAX_OVERSEAS)
 
     # ---- 3) 可选精炼 ----
     deals = refine_with_model(deals)
 
-    for x in deals + funds + overseas:
-        new_keys.append(x["_k"])
+    title, body = render_briefing(deals, funds, overseas, now_cn)
+    return title, body, deals + funds + overseas
+
+
+def render_briefing(deals: List[Dict], funds: List[Dict], overseas: List[Dict],
+                    now_cn: datetime.datetime) -> Tuple[str, str]:
+    today = now_cn.strftime("%Y-%m-%d")
 
-    # ---- 4) 组装 ----
     disclosed = sum(1 for d in deals if d["amount_hint"] != "未披露")
     src_ok = sum(1 for s in SRC_STATUS if s["ok"])
     src_all = len(SRC_STATUS)
@@ -602,10 +986,35 @@ def build_briefing(seen: Dict[str, str]) -> Tuple[str, str, List[str]]:
         for s in bad:
             md.append(f"- {s['name']}：{s['err']}")
 
+    if SHOW_SCORES:
+        md.append("\n## 🔎 排序明细")
+        for label, xs in (("融资", deals), ("基金", funds), ("海外", overseas)):
+            for x in xs:
+                why = " ".join(f"{k}={v:.1f}" for k, v in x.get("_why", {}).items())
+                md.append(f"- [{label}] {x.get('_score', 0):.2f}｜{why}｜{x['title'][:30]}")
+
     md.append(f"\n---\n窗口：{MAX_AGE_HOURS}h｜生成于 {now_cn.strftime('%Y-%m-%d %H:%M')} (UTC+8)")
 
     title = f"{today} 投融资晨报 | {len(deals)}条 | 源 {src_ok}/{src_all}"
-    return title, "\n".join(md), new_keys
+    return title, "\n".join(md)
+
+
+def publish(sendkey: str, title: str, body: str, new_items: List[Dict],
+            seen: Dict[str, str], today: str) -> None:
+    """落盘 → 推送 → 记 seen → 归档。单次跑批和常驻模式的晨报共用这一段。"""
+    # 落盘（供 Actions 上传 artifact）
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    (OUT_DIR / f"{today}.md").write_text(body, encoding="utf-8")
+    # latest.md 只是指向当天文件的链接，不再复制一份全文
+    latest = OUT_DIR / "latest.md"
+    latest.unlink(missing_ok=True)
+    try:
+        latest.symlink_to(f"{today}.md")
+    except OSError:   # 不支持符号链接的文件系统，退回复制
+        latest.write_text(body, encoding="utf-8")
+
+    deliver(sendkey, title, body, new_items, seen, today)
+    log(f"推送成功：{title}")
 
 
 def main() -> int:
@@ -621,20 +1030,14 @@ def main() -> int:
         seen = load_seen()
         log(f"已有去重记录 {len(seen)} 条")
 
-        title, body, new_keys = build_briefing(seen)
-
-        # 落盘（供 Actions 上传 artifact）
-        OUT_DIR.mkdir(parents=True, exist_ok=True)
-        (OUT_DIR / f"{today}.md").write_text(body, encoding="utf-8")
-        (OUT_DIR / "latest.md").write_text(body, encoding="utf-8")
-
-        # 先推送，成功后再落 seen —— 顺序反了的话推送失败就永久丢了这批
-        post_to_serverchan(sendkey, title, body)
-        log(f"推送成功：{title}")
+        # 上次推到一半的先推完，它的条目进了 seen 才不会在今天的简报里重复。
+        # 续推的就是今天的简报（当天手动重跑）时，推完就算数，不再另出一份
+        if finish_delivery(sendkey, seen) == today:
+            log("今天的简报已续推完成，不再重新生成")
+            return 0
 
-        for k in new_keys:
-            seen[k] = today
-        save_seen(seen)
+        title, body, new_items = build_briefing(seen)
+        publish(sendkey, title, body, new_items, seen, today)
         return 0
 
     except Exception as ex:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地替身推送端点，模拟 Server酱 的 /{sendkey}.send。联调分段推送、断点续推时用，
+不占真实额度。
+
+    python mock_push.py --port 8765 --fail-after 1
+    SERVERCHAN_URL=http://127.0.0.1:8765/{sendkey}.send SENDKEY=test python main.py
+
+--fail-after N：收下 N 条之后一律回 500，用来模拟推到一半断掉。
+相同 Idempotency-Key 的重复请求直接回成功，不重复记录。
+收到的每条消息按序写进 --dump 指定的 JSON 文件。
+"""
+
+import json
+import argparse
+import pathlib
+import urllib.parse
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+
+class Handler(BaseHTTPRequestHandler):
+    received = []          # [{"title":..., "desp":..., "key":...}]
+    keys = set()
+    fail_after = None
+    dump = None
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        form = urllib.parse.parse_qs(raw.decode("utf-8"))
+        key = self.headers.get("Idempotency-Key", "")
+
+        if key and key in self.keys:
+            return self._reply(200, {"code": 0, "message": "duplicate, ignored"})
+        if self.fail_after is not None and len(self.received) >= self.fail_after:
+            return self._reply(500, {"code": 500, "message": "injected failure"})
+
+        msg = {"title": form.get("title", [""])[0], "desp": form.get("desp", [""])[0], "key": key}
+        self.received.append(msg)
+        if key:
+            self.keys.add(key)
+        if self.dump:
+            self.dump.write_text(json.dumps(self.received, ensure_ascii=False, indent=1),
+                                 encoding="utf-8")
+        print(f"[{len(self.received)}] {msg['title']}（{len(msg['desp'])} 字）", flush=True)
+        self._reply(200, {"code": 0, "message": ""})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--fail-after", type=int, default=None)
+    ap.add_argument("--dump", type=pathlib.Path, default=None)
+    args = ap.parse_args()
+
+    Handler.fail_after = args.fail_after
+    Handler.dump = args.dump
+    print(f"替身推送端点：http://127.0.0.1:{args.port}/{{sendkey}}.send", flush=True)
+    HTTPServer(("127.0.0.1", args.port), Handler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()